@@ -12,6 +12,7 @@ Dependencies:
   - pandas
   - numpy
   - matplotlib
+  - numba (optional, only required when use_numba_kde is set)
 
 Created on: Tue 21 Mar 2023
 
@@ -19,18 +20,405 @@ Created on: Tue 21 Mar 2023
 """
 ### Imports
 from typing import TypeVar, Union, Literal
-from itertools import count
-from pandas import DataFrame, Series
+from types import MappingProxyType
+from functools import lru_cache
+from numbers import Number
+from operator import itemgetter
+from weakref import finalize
+from pandas import DataFrame
 from matplotlib.axes import Axes
-from numpy import where
-from numpy.random import uniform
+from matplotlib.cbook import violin_stats
+from numpy import (
+    ndarray, arange, asarray, broadcast_to, concatenate, empty, exp, float64,
+    fromiter, int64, multiply, pi, sqrt
+)
+from numpy.random import Generator, default_rng
 
 ### Type Variables
 _data_name = TypeVar('_data_name')
 _group_name = TypeVar('_group_name')
 _ord = TypeVar('_ord')
 
+### Constants
+_DEFAULT_BOX_KWARGS = MappingProxyType(
+    dict(
+        widths = 0.2,
+        showfliers = False,
+        showmeans = True,
+        meanline = True,
+        medianprops = MappingProxyType(dict(color = 'Black')),
+        boxprops = MappingProxyType(dict(color = 'Black'))
+    )
+)
+
+_DEFAULT_CLOUD_KWARGS = MappingProxyType(
+    dict(
+        showmeans = False,
+        showmedians = False,
+        showextrema = False,
+        widths = 1.2
+    )
+)
+
+### Caches
+# _prepare_groups outputs, keyed on id(df) then on the remaining args.
+# Each frame's entries are dropped when it is garbage collected, and
+# bounded to the _GROUPS_CACHE_SIZE most recently used.
+_GROUPS_CACHE: dict[int, dict[tuple, tuple]] = {}
+_GROUPS_CACHE_SIZE = 8
+
 ### Functions
+@lru_cache(maxsize = None)
+def _numba_gaussian_kde() -> callable:
+    """
+    Compiles a parallel gaussian kernel density estimator with numba.
+
+    Compilation is deferred to first use so numba remains an optional
+    dependency.
+    """
+    try:
+        from numba import njit, prange
+    except ImportError as e:
+        raise ImportError(
+            'numba is required when use_numba_kde is set'
+        ) from e
+
+    @njit(parallel = True, fastmath = True)
+    def gaussian_kde(data, coords, bandwidth):
+        n = data.shape[0]
+        norm = 1.0 / (n * bandwidth * sqrt(2 * pi))
+        out = empty(coords.shape[0])
+        for j in prange(coords.shape[0]):
+            acc = 0.0
+            for i in range(n):
+                z = (coords[j] - data[i]) / bandwidth
+                acc += exp(-0.5 * z * z)
+            out[j] = acc * norm
+        return out
+
+    return gaussian_kde
+
+
+def _numba_kde_method(
+    bw_method: Union[Literal['scott', 'silverman'], float, None]
+) -> callable:
+    """
+    Gets a kde method, for use with matplotlib's violin_stats, that
+    evaluates the density with _numba_gaussian_kde.
+
+    bw_method follows matplotlib's violinplot, excluding callables.
+    """
+    if bw_method is None or bw_method == 'scott':
+        factor = lambda n: n ** -0.2
+
+    elif bw_method == 'silverman':
+        factor = lambda n: (n * 0.75) ** -0.2
+
+    elif isinstance(bw_method, Number):
+        factor = lambda n: bw_method
+
+    else:
+        raise ValueError(
+            f'bw_method arg not supported with use_numba_kde: {bw_method}'
+        )
+
+    gaussian_kde = _numba_gaussian_kde()
+
+    def kde_method(X: ndarray, coords: ndarray) -> ndarray:
+        X = asarray(X, dtype = float64)
+        # fallback gracefully if X contains only one value, as matplotlib
+        if (X[0] == X).all():
+            return (X[0] == coords).astype(float)
+
+        bandwidth = X.std(ddof = 1) * factor(len(X))
+        return gaussian_kde(X, asarray(coords, dtype = float64), bandwidth)
+
+    return kde_method
+
+
+def _fast_col(df: DataFrame, col: _data_name) -> ndarray:
+    """
+    Gets the values of column col straight from df's BlockManager,
+    skipping the Series construction of df[col].
+
+    This relies on pandas' private internals, so falls back to
+    df[col].to_numpy() for duplicated column names, columns not backed
+    by a numpy array, or pandas versions without the BlockManager API.
+    """
+    loc = df.columns.get_loc(col)
+    if isinstance(loc, int):
+        try:
+            values = df._mgr.iget_values(loc)
+        except AttributeError:
+            pass
+        else:
+            if isinstance(values, ndarray):
+                return values
+
+    return df[col].to_numpy(copy = False)
+
+
+def _prepare_groups(
+    df: DataFrame,
+    col: _data_name,
+    group_by: Union[_group_name, None],
+    group_order: Union[callable, _group_name, dict[str, _ord], None],
+    reverse: bool,
+    fast_path: bool = True
+) -> tuple[list[ndarray], list]:
+    """
+    Splits the data in 'col' into one array per category of 'group_by',
+    ordered according to 'group_order'.
+
+    Returns
+    -------
+    tuple of the data arrays and their corresponding label names.
+    """
+    values = (
+        _fast_col(df, col) if fast_path
+        else df[col].to_numpy(copy = False)
+    )
+    if group_by is None:
+        return [values], [col]
+
+    # split data into (category, data) pairs by positional indexing
+    groups = [
+        (cat, values[idx_vals])
+        for cat, idx_vals
+        in df.groupby(by = group_by, sort = False).indices.items()
+    ]
+
+    # reorder groups according to group order
+    if group_order is None:
+        key = None
+
+    elif isinstance(group_order, dict):
+        key = lambda el: group_order[el[0]]
+
+    elif group_order == group_by:
+        key = itemgetter(0)
+
+    elif callable(group_order):
+        key = lambda el: group_order(el[1])
+
+    else:
+        raise ValueError(
+            f'group_order arg not recognised as valid: {group_order}'
+        )
+
+    if key is not None:
+        groups.sort(key = key, reverse = reverse)
+
+    return [data for _, data in groups], [cat for cat, _ in groups]
+
+
+def _cached_prepare_groups(
+    df: DataFrame,
+    col: _data_name,
+    group_by: Union[_group_name, None],
+    group_order: Union[callable, _group_name, dict[str, _ord], None],
+    reverse: bool,
+    fast_path: bool = True
+) -> tuple[list[ndarray], list]:
+    """
+    Memoized _prepare_groups. Outputs are cached against the identity of
+    df and dropped once df is garbage collected, so df must not be
+    modified between calls.
+
+    Outputs are only cached when group_order is None, a column name or
+    a dictionary; callables are not cached, as they cannot be compared
+    between calls and may hold references to df. Args that cannot be
+    hashed are also not cached.
+    """
+    if callable(group_order):
+        return _prepare_groups(
+            df, col, group_by, group_order, reverse, fast_path
+        )
+
+    # lists and dictionaries are keyed on their contents, tagged so they
+    # cannot collide with tuple column names
+    key = (
+        col,
+        (
+            ('__list__', *group_by) if isinstance(group_by, list)
+            else group_by
+        ),
+        (
+            ('__dict__', *group_order.items())
+            if isinstance(group_order, dict)
+            else group_order
+        ),
+        reverse
+    )
+    try:
+        hash(key)
+    except TypeError:
+        return _prepare_groups(
+            df, col, group_by, group_order, reverse, fast_path
+        )
+
+    if (df_cache := _GROUPS_CACHE.get(id(df))) is None:
+        df_cache = _GROUPS_CACHE[id(df)] = {}
+        finalize(df, _GROUPS_CACHE.pop, id(df), None)
+
+    # re-inserting keeps df_cache ordered from least to most recently used
+    if (groups := df_cache.pop(key, None)) is None:
+        groups = _prepare_groups(
+            df, col, group_by, group_order, reverse, fast_path
+        )
+        if len(df_cache) >= _GROUPS_CACHE_SIZE:
+            del df_cache[next(iter(df_cache))]
+
+    df_cache[key] = groups
+    return groups
+
+
+def _compute_scalars(
+    plot_data: list[ndarray],
+    label_names: list,
+    scale_clouds: Union[Literal['max'], dict[str, Union[int, float]], None]
+) -> list[Union[int, float]]:
+    """
+    Gets the scalar applied to each category's cloud.
+    """
+    if scale_clouds is None:
+        return [1 for _ in plot_data]
+
+    elif scale_clouds == 'max':
+        sizes = fromiter(
+            (len(el) for el in plot_data),
+            dtype = int64,
+            count = len(plot_data)
+        )
+        return (sizes / sizes.max()).tolist()
+
+    elif isinstance(scale_clouds, dict):
+        if any(v < 0 or v > 1 for v in scale_clouds.values()):
+            err_vals = {
+                k: v for k, v in scale_clouds.items() if v < 0 or v > 1
+            }
+            raise ValueError(
+                f'Some scalar values are out of bounds. {err_vals}'
+            )
+
+        return [scale_clouds[el] for el in label_names]
+
+    else:
+        raise ValueError(
+            f'scale_clouds arg not recognised as valid: {scale_clouds}'
+        )
+
+
+def _get_positions(
+    n_groups: int,
+    box_kwargs: Union[dict, None],
+    cloud_kwargs: Union[dict, None]
+) -> ndarray:
+    """
+    Gets the position of each category along the category axis, shared
+    by every component of the plot. 'positions' given in cloud_kwargs
+    take precedence over those in box_kwargs, otherwise categories are
+    placed at 1 to n_groups.
+    """
+    for kwargs in (cloud_kwargs, box_kwargs):
+        if isinstance(kwargs, dict) and kwargs.get('positions') is not None:
+            return asarray(kwargs['positions'], dtype = float64)
+
+    return arange(1, n_groups + 1)
+
+
+def _build_box(
+    ax: Axes,
+    plot_data: list[ndarray],
+    label_names: list,
+    positions: ndarray,
+    vert: bool,
+    box_kwargs: Union[dict, None]
+) -> dict:
+    """
+    Renders the boxplot component on ax.
+    """
+    if box_kwargs is None:
+        box_kwargs = {}
+
+    elif not isinstance(box_kwargs, dict):
+        raise ValueError(
+            f'box_kwargs arg not recognised as valid: {box_kwargs}'
+        )
+
+    # latter kwargs will take precedence over former. boxprops is copied
+    # as boxplot modifies it in place when patch_artist is set:
+    bp = {
+        **_DEFAULT_BOX_KWARGS,
+        'boxprops': dict(_DEFAULT_BOX_KWARGS['boxprops']),
+        **box_kwargs,
+        'labels': label_names,
+        'x': plot_data,
+        'positions': positions,
+        'vert': vert
+    }
+    return ax.boxplot(**bp)
+
+
+def _label_groups(
+    ax: Axes,
+    label_names: list,
+    positions: ndarray,
+    vert: bool
+) -> None:
+    """
+    Labels each category's position on ax, as the boxplot would have.
+    """
+    (ax.set_xticks if vert else ax.set_yticks)(positions, label_names)
+
+
+def _build_violin(
+    ax: Axes,
+    plot_data: list[ndarray],
+    scalars: list[Union[int, float]],
+    positions: ndarray,
+    vert: bool,
+    cloud_kwargs: Union[dict, None],
+    use_numba_kde: bool = False
+) -> dict:
+    """
+    Renders the cloud component on ax: the upper half of violin plots,
+    scaled by scalars.
+    """
+    if cloud_kwargs is None:
+        cloud_kwargs = {}
+
+    elif not isinstance(cloud_kwargs, dict):
+        raise ValueError(
+            f'cloud_kwargs arg not recognised as valid: {cloud_kwargs}'
+        )
+
+    # latter kwargs will take precedence over former. Only the upper half
+    # of each violin is drawn, its width scaled by the cloud's scalar:
+    vp = {**_DEFAULT_CLOUD_KWARGS, **cloud_kwargs}
+    vp.update(
+        dataset = plot_data,
+        positions = positions,
+        vert = vert,
+        side = 'high',
+        widths = multiply(vp['widths'], scalars)
+    )
+
+    if use_numba_kde:
+        # compute the violin stats here, bypassing violinplot's kde
+        vpstats = violin_stats(
+            vp.pop('dataset'),
+            _numba_kde_method(vp.pop('bw_method', None)),
+            points = vp.pop('points', 100),
+            quantiles = vp.pop('quantiles', None)
+        )
+        vp = ax.violin(vpstats, **vp)
+    else:
+        vp = ax.violinplot(**vp)
+
+    return vp
+
+
 def pyplot_cloud(
     df: DataFrame,
     col: _data_name,
@@ -43,7 +431,12 @@ def pyplot_cloud(
     ] = None,
     vert: bool = False,
     box_kwargs: Union[dict, None] = None,
-    cloud_kwargs: Union[dict, None] = None
+    cloud_kwargs: Union[dict, None] = None,
+    use_numba_kde: bool = False,
+    cache: bool = False,
+    fast_path: bool = True,
+    box: bool = True,
+    cloud: bool = True
 ) -> dict[Literal['box', 'cloud', 'scats'], dict]:
     """
     Creates a cloud plot, a raincloud plot without the rain.
@@ -75,8 +468,9 @@ def pyplot_cloud(
             dictionary: mapping category names to some ordinal.
 
             callable: Some function that provides an ordinal output,
-            used to order by some feature of the category's data. (e.g.
-            passing len will order the categorys by their size)
+            used to order by some feature of the category's data. The
+            category's data is passed as a numpy array. (e.g. passing
+            len will order the categorys by their size)
 
     reverse: bool. Default: False.
         By default, the group ordering is ascending.
@@ -104,7 +498,8 @@ def pyplot_cloud(
 
         NOTE: Any kwargs passed here will override this function's
         internal boxplot kwargs. In particular be careful with 'widths',
-        as altering this value may cause visuals to overlap.
+        as altering this value may cause visuals to overlap. Any
+        'positions' given here are also used for the other components.
 
         Default kwargs:
             widths = 0.2,
@@ -121,6 +516,10 @@ def pyplot_cloud(
         NOTE: Any kwargs passed here will override this function's
         internal kwargs for vioilin plot. In particular be careful with
         'widths', as altering this value may cause visuals to overlap.
+        'side' is always set to 'high', and 'widths' is multiplied by
+        the cloud scalars from scale_clouds. Any 'positions' given here
+        are also used for the other components, taking precedence over
+        'positions' in box_kwargs.
 
         Default kwargs:
             showmeans = False,
@@ -128,177 +527,58 @@ def pyplot_cloud(
             showextrema = False,
             widths = 1.2
 
-    Returns
-    -------
-    dictionary containing the outputs of each visual for further
-    customization.
-    """
-    if isinstance(group_by, type(None)):
-        plot_data = [df[col].tolist()]
-        label_names = [col]
-    else:
-        # extract groups according to group order
-        if isinstance(group_order, type(None)):
-            plot_data = {
-                cat: df.loc[idx_vals, col].tolist()
-                for cat, idx_vals
-                in df.groupby(by = group_by, sort = False).groups.items()
-            }
-            label_names = list(plot_data.keys())
-            plot_data = list(plot_data.values())
-
-        elif isinstance(group_order, dict):
-            plot_data: list[Series] = sorted(
-                (
-                    Series(df.loc[idx_vals, col], name = cat)
-                    for cat, idx_vals
-                    in df.groupby(by = group_by, sort = False).groups.items()
-                ),
-                key = lambda el: group_order[el.name],
-                reverse = reverse
-            )
-            label_names = [el.name for el in plot_data]
-            plot_data = [el.tolist() for el in plot_data]
-
-        elif group_order == group_by:
-            plot_data = {
-                cat: df.loc[idx_vals, col].tolist()
-                for cat, idx_vals
-                in df.groupby(by = group_by, sort = False).groups.items()
-            }
-            label_names = sorted(plot_data.keys(), reverse = reverse)
-            plot_data = list(plot_data[el] for el in label_names)
-
-        elif callable(group_order):
-            plot_data: list[Series] = sorted(
-                (
-                    Series(df.loc[idx_vals, col], name = cat)
-                    for cat, idx_vals
-                    in df.groupby(by = group_by, sort = False).groups.items()
-                ),
-                key = group_order,
-                reverse = reverse
-            )
-            label_names = [el.name for el in plot_data]
-            plot_data = [el.tolist() for el in plot_data]
-
-        else:
-            raise ValueError(
-                f'group_order arg not recognised as valid: {group_order}'
-            )
-
-    # get cloud scalars
-    if isinstance(scale_clouds, type(None)):
-        scalars = [1 for _ in plot_data]
+    use_numba_kde: bool. Default: False.
+        Whether to compute the clouds' kernel density estimates with a
+        parallel numba kernel instead of matplotlib's. Useful for large
+        datasets. Requires numba to be installed. The 'bw_method'
+        cloud kwarg is supported, except as a callable.
 
-    elif scale_clouds == 'max':
-        scalars = len(max(plot_data, key = len))
-        scalars = [
-            1 if len(el) == scalars else len(el)/scalars for el in plot_data
-        ]
+    cache: bool. Default: False.
+        Whether to reuse the grouped data from previous calls made with
+        the same df, col, group_by, group_order and reverse args. Useful
+        when repeatedly plotting the same data, e.g. in dashboards or
+        animations. df must not be modified between cached calls.
+        Grouped data is not cached when group_order is a callable.
 
-    elif isinstance(scale_clouds, dict):
-        if len(
-            err_vals:= {
-                k: v for k, v in scale_clouds.items() if v < 0 or v > 1
-            }
-        ):
-            raise ValueError(
-                f'Some scalar values are out of bounds. {err_vals}'
-            )
+    fast_path: bool. Default: True.
+        Whether to read 'col' directly from df's internal storage rather
+        than through df[col]. This uses private pandas API, falling back
+        to df[col] where unsupported; set False to always use df[col].
 
-        scalars = [scale_clouds[el] for el in label_names]
+    box: bool. Default: True.
+        Whether to render the boxplot component. If False, no boxplot
+        statistics are computed and the 'box' output is None.
 
-    else:
-        raise ValueError(
-            f'scale_clouds arg not recognised as valid: {scale_clouds}'
-        )
+    cloud: bool. Default: True.
+        Whether to render the cloud component. If False, no kernel
+        density estimates are computed and the 'cloud' output is None.
 
-    # build boxplot
-    if isinstance(box_kwargs, type(None)):
-        bp = ax.boxplot(
-            labels = label_names,
-            x = plot_data,
-            vert = vert,
-            widths = 0.2,
-            showfliers = False,
-            showmeans = True,
-            meanline = True,
-            medianprops = dict(color = 'Black'),
-            boxprops = dict(color = 'Black')
+    Returns
+    -------
+    dictionary containing the outputs of each visual for further
+    customization.
+    """
+    plot_data, label_names = (
+        _cached_prepare_groups if cache else _prepare_groups
+    )(df, col, group_by, group_order, reverse, fast_path)
+    positions = _get_positions(len(plot_data), box_kwargs, cloud_kwargs)
+    scalars = _compute_scalars(plot_data, label_names, scale_clouds)
+
+    if box:
+        bp = _build_box(
+            ax, plot_data, label_names, positions, vert, box_kwargs
         )
-
-    elif isinstance(box_kwargs, dict):
-        # latter kwargs will take precedence over former:
-        bp = {
-            **dict(
-                widths = 0.2,
-                showfliers = False,
-                showmeans = True,
-                meanline = True,
-                medianprops = dict(color = 'Black'),
-                boxprops = dict(color = 'Black')
-            ),
-            **box_kwargs,
-            **dict(
-                labels = label_names,
-                x = plot_data,
-                vert = vert
-            )
-        }
-        bp = ax.boxplot(**bp)
-
     else:
-        raise ValueError(
-            f'box_kwargs arg not recognised as valid: {box_kwargs}'
-        )
+        bp = None
+        _label_groups(ax, label_names, positions, vert)
 
-    # build violin plot
-    if isinstance(cloud_kwargs, type(None)):
-        vp = ax.violinplot(
-            dataset = plot_data,
-            vert = vert,
-            showmeans = False,
-            showmedians = False,
-            showextrema = False,
-            widths = 1.2
+    if cloud:
+        vp = _build_violin(
+            ax, plot_data, scalars, positions, vert, cloud_kwargs,
+            use_numba_kde
         )
-
-    elif isinstance(cloud_kwargs, dict):
-        # latter kwargs will take precedence over former:
-        vp = {
-            **dict(
-                showmeans = False,
-                showmedians = False,
-                showextrema = False,
-                widths = 1.2
-            ),
-            **cloud_kwargs,
-            **dict(
-                dataset = plot_data,
-                vert = vert
-            )
-        }
-        vp = ax.violinplot(**vp)
-
     else:
-        raise ValueError(
-            f'cloud_kwargs arg not recognised as valid: {cloud_kwargs}'
-        )
-    
-    for idx, scale, body in zip(count(), scalars, vp['bodies']):
-
-        # Modify body to show only the upper half of the violin plot
-        width_vals = body.get_paths()[0].vertices[:, 1]
-
-        width_vals = scale * where(
-            width_vals <= idx + 1,
-            0,
-            width_vals - idx - 1
-        )
-
-        # Update body
-        body.get_paths()[0].vertices[:, 1] = width_vals + idx + 1
+        vp = None
 
     return {'box': bp, 'cloud': vp}
 
@@ -315,12 +595,19 @@ def pyplot_raincloud(
     ] = None,
     vert: bool = False,
     box_kwargs: Union[dict, None] = None,
-    cloud_kwargs: Union[dict, None] = None
+    cloud_kwargs: Union[dict, None] = None,
+    use_numba_kde: bool = False,
+    cache: bool = False,
+    fast_path: bool = True,
+    box: bool = True,
+    cloud: bool = True,
+    seed: Union[int, Generator, None] = None
 ) -> dict[Literal['box', 'cloud', 'scats'], dict]:
     """
     Creates a Raincloud plot.
 
-    rain colour will always equal cloud colour.
+    rain colour will always equal cloud colour, when the cloud is
+    rendered.
 
     Parameters
     ----------
@@ -349,8 +636,9 @@ def pyplot_raincloud(
             dictionary: mapping category names to some ordinal.
 
             callable: Some function that provides an ordinal output,
-            used to order by some feature of the category's data. (e.g.
-            passing len will order the categorys by their size)
+            used to order by some feature of the category's data. The
+            category's data is passed as a numpy array. (e.g. passing
+            len will order the categorys by their size)
 
     reverse: bool. Default: False.
         By default, the group ordering is ascending.
@@ -378,7 +666,8 @@ def pyplot_raincloud(
 
         NOTE: Any kwargs passed here will override this function's
         internal boxplot kwargs. In particular be careful with 'widths',
-        as altering this value may cause visuals to overlap.
+        as altering this value may cause visuals to overlap. Any
+        'positions' given here are also used for the other components.
 
         Default kwargs:
             widths = 0.2,
@@ -395,6 +684,10 @@ def pyplot_raincloud(
         NOTE: Any kwargs passed here will override this function's
         internal kwargs for vioilin plot. In particular be careful with
         'widths', as altering this value may cause visuals to overlap.
+        'side' is always set to 'high', and 'widths' is multiplied by
+        the cloud scalars from scale_clouds. Any 'positions' given here
+        are also used for the other components, taking precedence over
+        'positions' in box_kwargs.
 
         Default kwargs:
             showmeans = False,
@@ -402,190 +695,99 @@ def pyplot_raincloud(
             showextrema = False,
             widths = 1.2
 
-    Returns
-    -------
-    dictionary containing the outputs of each visual for further
-    customization.
-    """
-    if isinstance(group_by, type(None)):
-        plot_data = [df[col].tolist()]
-        label_names = [col]
-    else:
-        # extract groups according to group order
-        if isinstance(group_order, type(None)):
-            plot_data = {
-                cat: df.loc[idx_vals, col].tolist()
-                for cat, idx_vals
-                in df.groupby(by = group_by, sort = False).groups.items()
-            }
-            label_names = list(plot_data.keys())
-            plot_data = list(plot_data.values())
-
-        elif isinstance(group_order, dict):
-            plot_data: list[Series] = sorted(
-                (
-                    Series(df.loc[idx_vals, col], name = cat)
-                    for cat, idx_vals
-                    in df.groupby(by = group_by, sort = False).groups.items()
-                ),
-                key = lambda el: group_order[el.name],
-                reverse = reverse
-            )
-            label_names = [el.name for el in plot_data]
-            plot_data = [el.tolist() for el in plot_data]
-
-        elif group_order == group_by:
-            plot_data = {
-                cat: df.loc[idx_vals, col].tolist()
-                for cat, idx_vals
-                in df.groupby(by = group_by, sort = False).groups.items()
-            }
-            label_names = sorted(plot_data.keys(), reverse = reverse)
-            plot_data = list(plot_data[el] for el in label_names)
-
-        elif callable(group_order):
-            plot_data: list[Series] = sorted(
-                (
-                    Series(df.loc[idx_vals, col], name = cat)
-                    for cat, idx_vals
-                    in df.groupby(by = group_by, sort = False).groups.items()
-                ),
-                key = group_order,
-                reverse = reverse
-            )
-            label_names = [el.name for el in plot_data]
-            plot_data = [el.tolist() for el in plot_data]
-
-        else:
-            raise ValueError(
-                f'group_order arg not recognised as valid: {group_order}'
-            )
+    use_numba_kde: bool. Default: False.
+        Whether to compute the clouds' kernel density estimates with a
+        parallel numba kernel instead of matplotlib's. Useful for large
+        datasets. Requires numba to be installed. The 'bw_method'
+        cloud kwarg is supported, except as a callable.
 
-    # get cloud scalars
-    if isinstance(scale_clouds, type(None)):
-        scalars = [1 for _ in plot_data]
+    cache: bool. Default: False.
+        Whether to reuse the grouped data from previous calls made with
+        the same df, col, group_by, group_order and reverse args. Useful
+        when repeatedly plotting the same data, e.g. in dashboards or
+        animations. df must not be modified between cached calls.
+        Grouped data is not cached when group_order is a callable.
 
-    elif scale_clouds == 'max':
-        scalars = len(max(plot_data, key = len))
-        scalars = [
-            1 if len(el) == scalars else len(el)/scalars for el in plot_data
-        ]
+    fast_path: bool. Default: True.
+        Whether to read 'col' directly from df's internal storage rather
+        than through df[col]. This uses private pandas API, falling back
+        to df[col] where unsupported; set False to always use df[col].
 
-    elif isinstance(scale_clouds, dict):
-        if len(
-            err_vals := {
-                k: v for k, v in scale_clouds.items() if v < 0 or v > 1
-            }
-        ):
-            raise ValueError(
-                f'Some scalar values are out of bounds. {err_vals}'
-            )
+    box: bool. Default: True.
+        Whether to render the boxplot component. If False, no boxplot
+        statistics are computed and the 'box' output is None.
 
-        scalars = [scale_clouds[el] for el in label_names]
+    cloud: bool. Default: True.
+        Whether to render the cloud component. If False, no kernel
+        density estimates are computed and the 'cloud' output is None.
 
-    else:
-        raise ValueError(
-            f'scale_clouds arg not recognised as valid: {scale_clouds}'
-        )
+    seed: int, Generator or None. Default: None.
+        Seed for the rain's random jitter, passed to numpy's
+        default_rng. Set to get reproducible plots.
 
-    # build boxplot
-    if isinstance(box_kwargs, type(None)):
-        bp = ax.boxplot(
-            labels = label_names,
-            x = plot_data,
-            vert = vert,
-            widths = 0.2,
-            showfliers = False,
-            showmeans = True,
-            meanline = True,
-            medianprops = dict(color = 'Black'),
-            boxprops = dict(color = 'Black')
+    Returns
+    -------
+    dictionary containing the outputs of each visual for further
+    customization. The rain of every category is held in a single
+    PathCollection under 'scats'.
+    """
+    plot_data, label_names = (
+        _cached_prepare_groups if cache else _prepare_groups
+    )(df, col, group_by, group_order, reverse, fast_path)
+    positions = _get_positions(len(plot_data), box_kwargs, cloud_kwargs)
+    scalars = _compute_scalars(plot_data, label_names, scale_clouds)
+
+    if box:
+        bp = _build_box(
+            ax, plot_data, label_names, positions, vert, box_kwargs
         )
-
-    elif isinstance(box_kwargs, dict):
-        # latter kwargs will take precedence over former:
-        bp = {
-            **dict(
-                widths = 0.2,
-                showfliers = False,
-                showmeans = True,
-                meanline = True,
-                medianprops = dict(color = 'Black'),
-                boxprops = dict(color = 'Black')
-            ),
-            **box_kwargs,
-            **dict(
-                labels = label_names,
-                x = plot_data,
-                vert = vert
-            )
-        }
-        bp = ax.boxplot(**bp)
-
     else:
-        raise ValueError(
-            f'box_kwargs arg not recognised as valid: {box_kwargs}'
-        )
+        bp = None
+        _label_groups(ax, label_names, positions, vert)
 
-    # build violin plot
-    if isinstance(cloud_kwargs, type(None)):
-        vp = ax.violinplot(
-            dataset = plot_data,
-            vert = vert
+    if cloud:
+        vp = _build_violin(
+            ax, plot_data, scalars, positions, vert, cloud_kwargs,
+            use_numba_kde
         )
-
-    elif isinstance(cloud_kwargs, dict):
-        # latter kwargs will take precedence over former:
-        vp = {
-            **dict(
-                showmeans = False,
-                showmedians = False,
-                showextrema = False,
-                widths = 1.2
-            ),
-            **cloud_kwargs,
-            **dict(
-                dataset = plot_data,
-                vert = vert
-            )
-        }
-        vp = ax.violinplot(**vp)
-
     else:
-        raise ValueError(
-            f'cloud_kwargs arg not recognised as valid: {cloud_kwargs}'
-        )
-
-    # modify violin plot and add scatters
-    sc = dict()
-    for idx, scale, body in zip(count(), scalars, vp['bodies']):
-
-        # Modify body to show only the upper half of the violin plot
-        width_vals = body.get_paths()[0].vertices[:, 1]
-
-        width_vals = scale * where(
-            width_vals <= idx + 1,
-            0,
-            width_vals - idx - 1
+        vp = None
+
+    # add scatters as a single collection
+    rng = default_rng(seed)
+    rain, jitter = [], []
+    for pos, data in zip(positions, plot_data):
+
+        rain.append(data)
+
+        # get random positions for jittered scatter plot, centred just
+        # below the category's position
+        jitter.append(
+            rng.uniform(
+                low = pos - 0.4,
+                high = pos - 0.1,
+                size = len(data)
+            )
         )
 
-        # Update body
-        body.get_paths()[0].vertices[:, 1] = width_vals + idx + 1
+    # data runs along the y-axis when rendered vertically
+    rain, jitter = concatenate(rain), concatenate(jitter)
+    x, y = (jitter, rain) if vert else (rain, jitter)
 
-        # get random y-values for jittered scatter plot
-        jitter = uniform(
-            low = -0.15,
-            high = 0.15,
-            size = len(data := plot_data[idx])
-        )
-        jitter += idx + 0.75
-
-        # Add scatter plot
-        sc[idx] = ax.scatter(
-            x = data,
-            y = jitter,
-            s = .3,
-            c = body.get_facecolor()
-        )
+    # rain colour matches its cloud
+    if vp is None:
+        colours = None
+    else:
+        colours = concatenate([
+            broadcast_to(body.get_facecolor(), (len(data), 4))
+            for data, body in zip(plot_data, vp['bodies'])
+        ])
+
+    sc = ax.scatter(
+        x = x,
+        y = y,
+        s = .3,
+        c = colours
+    )
 
     return {'box': bp, 'cloud': vp, 'scats': sc}
\ No newline at end of file
@@ -0,0 +1,140 @@
+"""
+Tests for the grouped data cache used by cache = True.
+"""
+### Imports
+import gc
+import pytest
+from numpy import arange, array_equal
+from pandas import DataFrame
+from matplotlib.figure import Figure
+from mpl_ext import pyplot_cloud
+from mpl_ext.raincloud._raincloud import (
+    _GROUPS_CACHE,
+    _GROUPS_CACHE_SIZE,
+    _cached_prepare_groups,
+    _prepare_groups
+)
+
+### Fixtures
+def make_df() -> DataFrame:
+    return DataFrame(
+        {
+            'x': arange(12, dtype = float),
+            'g': list('cabd') * 3,
+            'h': list('xy') * 6
+        }
+    )
+
+
+@pytest.fixture
+def df() -> DataFrame:
+    return make_df()
+
+
+def assert_groups_equal(left, right):
+    assert left[1] == right[1]
+    assert len(left[0]) == len(right[0])
+    assert all(array_equal(a, b) for a, b in zip(left[0], right[0]))
+
+### Tests
+@pytest.mark.parametrize(
+    'group_by, group_order, reverse',
+    [
+        (None, None, False),
+        ('g', None, False),
+        ('g', 'g', False),
+        ('g', 'g', True),
+        ('g', {'a': 3, 'b': 2, 'c': 1, 'd': 0}, False),
+        (['g', 'h'], None, False),
+        (['g'], None, False),
+    ]
+)
+def test_cached_matches_uncached(df, group_by, group_order, reverse):
+    expected = _prepare_groups(df, 'x', group_by, group_order, reverse)
+
+    # first call populates the cache, second reads from it
+    for _ in range(2):
+        assert_groups_equal(
+            _cached_prepare_groups(df, 'x', group_by, group_order, reverse),
+            expected
+        )
+
+
+def test_list_and_tuple_group_by_not_conflated(df):
+    _cached_prepare_groups(df, 'x', ['g', 'h'], None, False)
+
+    # ('g', 'h') names a single column, which df does not have
+    with pytest.raises(KeyError):
+        _prepare_groups(df, 'x', ('g', 'h'), None, False)
+    with pytest.raises(KeyError):
+        _cached_prepare_groups(df, 'x', ('g', 'h'), None, False)
+
+
+def test_dict_group_order_keyed_on_items(df):
+    group_order = {'a': 0, 'b': 1, 'c': 2, 'd': 3}
+    assert _cached_prepare_groups(
+        df, 'x', 'g', group_order, False
+    )[1] == ['a', 'b', 'c', 'd']
+
+    group_order['a'] = 9
+    assert _cached_prepare_groups(
+        df, 'x', 'g', group_order, False
+    )[1] == ['b', 'c', 'd', 'a']
+
+
+def test_callable_group_order_not_cached(df):
+    for _ in range(3):
+        _cached_prepare_groups(df, 'x', 'g', lambda a: a.mean(), False)
+
+    assert id(df) not in _GROUPS_CACHE
+
+
+def test_unhashable_key_not_cached(df):
+    # list ordinals sort fine, but cannot be hashed into a key
+    group_order = {'a': [3], 'b': [2], 'c': [1], 'd': [0]}
+    assert_groups_equal(
+        _cached_prepare_groups(df, 'x', 'g', group_order, False),
+        _prepare_groups(df, 'x', 'g', group_order, False)
+    )
+    assert id(df) not in _GROUPS_CACHE
+
+
+def test_least_recently_used_entry_evicted(df):
+    orders = [
+        {'a': i, 'b': 0, 'c': 0, 'd': 0}
+        for i in range(_GROUPS_CACHE_SIZE + 1)
+    ]
+    for group_order in orders[:-1]:
+        _cached_prepare_groups(df, 'x', 'g', group_order, False)
+
+    # refresh the oldest entry, so the second oldest is evicted instead
+    first = _cached_prepare_groups(df, 'x', 'g', orders[0], False)
+    _cached_prepare_groups(df, 'x', 'g', orders[-1], False)
+
+    df_cache = _GROUPS_CACHE[id(df)]
+    assert len(df_cache) == _GROUPS_CACHE_SIZE
+    assert ('x', 'g', ('__dict__', *orders[1].items()), False) not in df_cache
+    assert _cached_prepare_groups(df, 'x', 'g', orders[0], False) is first
+
+
+def test_entries_dropped_with_frame():
+    # not the fixture, which pytest keeps a reference to
+    df = make_df()
+    _cached_prepare_groups(df, 'x', 'g', None, False)
+    df_id = id(df)
+    assert df_id in _GROUPS_CACHE
+
+    del df
+    gc.collect()
+    assert df_id not in _GROUPS_CACHE
+
+
+def test_pyplot_cloud_cache_matches_uncached(df):
+    medians = []
+    for cache in (False, True, True):
+        box = pyplot_cloud(
+            df, 'x', Figure().subplots(), 'g', 'g', cache = cache
+        )['box']
+        medians.append([line.get_xdata().tolist() for line in box['medians']])
+
+    assert medians[0] == medians[1] == medians[2]
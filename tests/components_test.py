@@ -0,0 +1,36 @@
+"""
+Tests for toggling the box and cloud components on and off.
+"""
+### Imports
+import pytest
+from numpy import arange
+from pandas import DataFrame
+from matplotlib.figure import Figure
+from mpl_ext import pyplot_cloud, pyplot_raincloud
+
+### Fixtures
+@pytest.fixture
+def df() -> DataFrame:
+    return DataFrame({'x': arange(12, dtype = float), 'g': list('abc') * 4})
+
+### Tests
+@pytest.mark.parametrize('plot', [pyplot_cloud, pyplot_raincloud])
+@pytest.mark.parametrize('box, cloud', [(True, False), (False, True)])
+def test_disabled_component_is_none(df, plot, box, cloud):
+    out = plot(df, 'x', Figure().subplots(), 'g', box = box, cloud = cloud)
+
+    assert (out['box'] is None) != box
+    assert (out['cloud'] is None) != cloud
+
+
+@pytest.mark.parametrize('plot', [pyplot_cloud, pyplot_raincloud])
+@pytest.mark.parametrize(
+    'scale_clouds', ['min', {'a': 2, 'b': .5, 'c': 1}]
+)
+def test_invalid_scale_clouds_raises_without_cloud(df, plot, scale_clouds):
+    with pytest.raises(ValueError):
+        plot(
+            df, 'x', Figure().subplots(), 'g',
+            scale_clouds = scale_clouds,
+            cloud = False
+        )
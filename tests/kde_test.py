@@ -0,0 +1,60 @@
+"""
+Tests for the optional numba kernel density estimate, use_numba_kde.
+"""
+### Imports
+import pytest
+from numpy import allclose, array, full, linspace
+from numpy.random import default_rng
+from pandas import DataFrame
+from matplotlib.figure import Figure
+from matplotlib.mlab import GaussianKDE
+from mpl_ext import pyplot_cloud
+from mpl_ext.raincloud._raincloud import _numba_kde_method
+
+### Tests
+@pytest.mark.parametrize('bw_method', [None, 'scott', 'silverman', 0.3])
+def test_numba_kde_matches_matplotlib(bw_method):
+    pytest.importorskip('numba')
+    X = default_rng(0).normal(size = 200)
+    coords = linspace(X.min(), X.max(), 100)
+
+    assert allclose(
+        _numba_kde_method(bw_method)(X, coords),
+        GaussianKDE(X, bw_method).evaluate(coords),
+        rtol = 1e-12,
+        atol = 1e-15
+    )
+
+
+def test_numba_kde_single_value_fallback():
+    pytest.importorskip('numba')
+    X = full(5, 2.0)
+    coords = array([1.0, 2.0, 3.0])
+
+    assert _numba_kde_method(None)(X, coords).tolist() == [0.0, 1.0, 0.0]
+
+
+def test_numba_kde_callable_bw_method_raises():
+    with pytest.raises(ValueError):
+        _numba_kde_method(lambda kde: 0.3)
+
+
+def test_pyplot_cloud_numba_kde_matches_violinplot():
+    pytest.importorskip('numba')
+    rng = default_rng(0)
+    df = DataFrame(
+        {'x': rng.normal(size = 300), 'g': rng.choice(list('abc'), 300)}
+    )
+
+    bodies = [
+        pyplot_cloud(
+            df, 'x', Figure().subplots(), 'g', 'g',
+            scale_clouds = 'max',
+            use_numba_kde = use_numba_kde
+        )['cloud']['bodies']
+        for use_numba_kde in (False, True)
+    ]
+    for left, right in zip(*bodies):
+        assert allclose(
+            left.get_paths()[0].vertices, right.get_paths()[0].vertices
+        )
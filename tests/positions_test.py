@@ -0,0 +1,102 @@
+"""
+Tests for the placement and geometry of each component of the plots.
+"""
+### Imports
+import pytest
+from numpy import allclose, array, cumsum, where
+from numpy.random import default_rng
+from pandas import DataFrame
+from matplotlib.figure import Figure
+from mpl_ext import pyplot_cloud, pyplot_raincloud
+from mpl_ext.raincloud._raincloud import _prepare_groups
+
+### Fixtures
+@pytest.fixture
+def df() -> DataFrame:
+    rng = default_rng(0)
+    return DataFrame(
+        {
+            'x': rng.normal(size = 300),
+            'g': rng.choice(list('abc'), 300, p = [.6, .3, .1])
+        }
+    )
+
+
+def upper_half(vertices, pos):
+    """
+    Vertices strictly above pos, as a sorted set of rounded points.
+    """
+    return sorted(
+        {(round(x, 9), round(y, 9)) for x, y in vertices if y > pos + 1e-12}
+    )
+
+### Tests
+@pytest.mark.parametrize('box', [True, False])
+def test_components_follow_cloud_positions(df, box):
+    positions = [2, 4, 6]
+    ax = Figure().subplots()
+    out = pyplot_raincloud(
+        df, 'x', ax, 'g', 'g',
+        cloud_kwargs = {'positions': positions},
+        box = box,
+        seed = 0
+    )
+
+    assert allclose(ax.get_yticks(), positions)
+    assert [t.get_text() for t in ax.get_yticklabels()] == ['a', 'b', 'c']
+
+    if box:
+        assert allclose(
+            [line.get_ydata().mean() for line in out['box']['medians']],
+            positions
+        )
+
+    # rain is drawn in category order, just below each position
+    plot_data, _ = _prepare_groups(df, 'x', 'g', 'g', False)
+    jitter = out['scats'].get_offsets()[:, 1]
+    bounds = cumsum([0] + [len(data) for data in plot_data])
+    for pos, start, stop in zip(positions, bounds[:-1], bounds[1:]):
+        assert (jitter[start:stop] >= pos - 0.4).all()
+        assert (jitter[start:stop] <= pos - 0.1).all()
+
+
+@pytest.mark.parametrize('scale_clouds', [None, 'max'])
+def test_half_clouds_match_clipped_violins(df, scale_clouds):
+    """
+    side = 'high' with scaled widths reproduces clipping full violins to
+    their upper half and scaling them.
+    """
+    out = pyplot_cloud(
+        df, 'x', Figure().subplots(), 'g', 'g', scale_clouds = scale_clouds
+    )
+
+    plot_data, _ = _prepare_groups(df, 'x', 'g', 'g', False)
+    if scale_clouds is None:
+        scalars = [1] * len(plot_data)
+    else:
+        sizes = array([len(data) for data in plot_data])
+        scalars = sizes / sizes.max()
+
+    expected = Figure().subplots().violinplot(
+        plot_data,
+        vert = False,
+        showmeans = False,
+        showmedians = False,
+        showextrema = False,
+        widths = 1.2
+    )
+    for idx, scale, body, expected_body in zip(
+        range(len(plot_data)), scalars, out['cloud']['bodies'],
+        expected['bodies']
+    ):
+        pos = idx + 1
+        vertices = expected_body.get_paths()[0].vertices
+        width_vals = vertices[:, 1]
+        vertices[:, 1] = scale * where(
+            width_vals <= pos, 0, width_vals - pos
+        ) + pos
+
+        actual = body.get_paths()[0].vertices
+        assert allclose(actual.min(axis = 0), vertices.min(axis = 0))
+        assert allclose(actual.max(axis = 0), vertices.max(axis = 0))
+        assert upper_half(actual, pos) == upper_half(vertices, pos)